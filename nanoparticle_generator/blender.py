@@ -1,14 +1,26 @@
 import os
 from contextlib import AbstractContextManager, contextmanager, redirect_stdout
 
+import bmesh
 import bpy
 import numpy as np
 import pyvista as pv
 import vtk
-from mathutils import Vector
+from mathutils import Euler, Matrix, Quaternion, Vector
+from vtk.util import numpy_support
+
+from nanoparticle_generator.kernels import points_fit_in_circle
 
 
 BLENDER_EPS = 1e-4  # Tolerance for Blender floating point operations
+RNG = np.random.default_rng()  # Random generator shared by all shapes
+_STL_DTYPE = np.dtype([('normal', '<f4', 3), ('vertices', '<f4', (3, 3)),
+                       ('attributes', '<u2')])  # Binary STL triangle record
+
+
+def seed(seed_value=None):
+    """Reseed the shared random generator for reproducible generation"""
+    RNG.bit_generator.state = np.random.default_rng(seed_value).bit_generator.state
 
 
 def _suppress_stdout(func):
@@ -20,6 +32,35 @@ def _suppress_stdout(func):
     return wrapper
 
 
+def deselect_all_objects():
+    """Deselect objects without the overhead of the select_all operator"""
+    for obj in bpy.context.selected_objects:
+        try:
+            obj.select_set(False)
+        except ReferenceError:
+            # The object got deleted
+            pass
+
+
+def add_mesh_object(name, mesh):
+    """Link a new object with given mesh to the scene and make it active
+
+    Mirrors the selection state left by operators adding objects.
+    """
+    object = bpy.data.objects.new(name, mesh)
+    bpy.context.collection.objects.link(object)
+    deselect_all_objects()
+    object.select_set(True)
+    bpy.context.view_layer.objects.active = object
+    return object
+
+
+def _set_mode(mode):
+    """Switch object/edit mode of the active object, skipping no-op switches"""
+    if bpy.context.object.mode != mode:
+        bpy.ops.object.mode_set(mode=mode)
+
+
 class BlenderScene(AbstractContextManager):
     def __init__(self):
         """Blender scene that gets cleared on exit from the context"""
@@ -32,6 +73,8 @@ class BlenderScene(AbstractContextManager):
 class BlenderObjectReference:
     def __init__(self, object):
         self.blender_object = object
+        self._coords_cache = None
+        self._world_coords_cache = None  # (matrix_world, transformed coords)
 
     def delete(self):
         """Delete the referenced object"""
@@ -39,6 +82,7 @@ class BlenderObjectReference:
             bpy.ops.object.delete()
 
     def copy(self):
+        self.finalize_transforms()
         with self.selected(mode='object'):
             bpy.ops.object.duplicate()
             return BlenderObjectReference(bpy.context.active_object)
@@ -48,6 +92,43 @@ class BlenderObjectReference:
         bpy.ops.import_mesh.stl(filepath=filepath)
         return cls(bpy.context.object)
 
+    @classmethod
+    def from_stl_fast(cls, filepath):
+        """Import binary STL by reading all triangles at once
+
+        Falls back to `from_stl` for ASCII files.
+        """
+        file_size = os.path.getsize(filepath)
+        if file_size < 84:  # Too short for a binary header
+            return cls.from_stl(filepath)
+        with open(filepath, 'rb') as f:
+            f.seek(80)  # Skip header
+            n_triangles = int(np.fromfile(f, dtype='<u4', count=1)[0])
+            if file_size != 84 + _STL_DTYPE.itemsize * n_triangles:
+                return cls.from_stl(filepath)
+            triangles = np.fromfile(f, dtype=_STL_DTYPE, count=n_triangles)
+        # Merge identical vertices shared by adjacent triangles
+        vertices, vertex_indices = np.unique(
+            triangles['vertices'].reshape(-1, 3), axis=0, return_inverse=True)
+
+        mesh = bpy.data.meshes.new(os.path.splitext(os.path.basename(filepath))[0])
+        mesh.vertices.add(len(vertices))
+        mesh.vertices.foreach_set('co', vertices.ravel())
+        mesh.loops.add(3 * n_triangles)
+        mesh.loops.foreach_set('vertex_index',
+                               vertex_indices.ravel().astype(np.intc))
+        mesh.polygons.add(n_triangles)
+        mesh.polygons.foreach_set('loop_start',
+                                  np.arange(0, 3 * n_triangles, 3, dtype=np.intc))
+        # Newer Blender versions derive polygon sizes from loop starts
+        if not mesh.polygons.bl_rna.properties['loop_total'].is_readonly:
+            mesh.polygons.foreach_set('loop_total',
+                                      np.full(n_triangles, 3, dtype=np.intc))
+        # Degenerate triangles have repeated vertices after merging
+        mesh.validate()
+        mesh.update(calc_edges=True)
+        return cls(add_mesh_object(mesh.name, mesh))
+
     @property
     def index(self):
         """Index of the object in the Blender data collection"""
@@ -56,77 +137,172 @@ class BlenderObjectReference:
     @property
     def location(self):
         """Bounding box center."""
-        return self.bounding_box[0] + self.dimensions/2
+        bounding_box = self.bound_box_np
+        return Vector((bounding_box.min(axis=0) + bounding_box.max(axis=0)) / 2)
 
-    def translate(self, translation_vector):
-        self.blender_object.location = translation_vector
-        self.apply_all_transforms()
+    def translate(self, translation_vector, defer=True):
+        self._transform(Matrix.Translation(translation_vector), defer)
 
     @property
     def rotation(self):
-        return self.blender_object.rotation_euler
+        """Rotation of the deferred transform, not yet applied to the mesh"""
+        return self.blender_object.matrix_world.to_euler()
 
-    def rotate(self, euler_angles=None, quaternion=None):
-        rotation_mode_init = self.blender_object.rotation_mode
+    def rotate(self, euler_angles=None, quaternion=None, defer=True):
         if euler_angles is not None:
-            self.blender_object.rotation_mode = 'XYZ'
-            self.blender_object.rotation_euler = euler_angles
+            rotation_matrix = Euler(euler_angles, 'XYZ').to_matrix()
         elif quaternion is not None:
-            self.blender_object.rotation_mode = 'QUATERNION'
-            self.blender_object.rotation_quaternion = quaternion
-        self.blender_object.rotation_mode = rotation_mode_init
-        self.apply_all_transforms()
+            rotation_matrix = Quaternion(quaternion).to_matrix()
+        else:
+            return
+        self._transform(rotation_matrix.to_4x4(), defer)
+
+    def scale(self, scale_vector, defer=True):
+        if np.ndim(scale_vector) == 0:
+            scale_vector = (float(scale_vector),) * 3
+        if len(set(scale_vector)) > 1:
+            # Non-uniform scaling of a rotated object is a shear, which
+            # Blender can't store in the object transform
+            self.finalize_transforms()
+        self._transform(Matrix.Diagonal(scale_vector).to_4x4(), defer)
+
+    def _transform(self, matrix, defer):
+        """Compose a transform with the current one and optionally apply it
+
+        Deferred transforms are applied to the mesh only once some operation
+        needs it (edit mode, modifiers, copying, export), so consecutive
+        transforms cost a single application.
+        """
+        self.set_matrix(matrix @ self.blender_object.matrix_world)
+        if not defer:
+            self.finalize_transforms()
 
-    def scale(self, scale_vector):
-        if isinstance(scale_vector, (float, int)):
-            scale_vector = (scale_vector,) * 3
-        self.blender_object.scale = scale_vector
-        self.apply_all_transforms()
+    def set_matrix(self, matrix):
+        """Set object transform directly, deferring its application to mesh"""
+        self.blender_object.matrix_world = Matrix(matrix)
+        self._world_coords_cache = None
+
+    @property
+    def _transforms_deferred(self):
+        # Stored on the object itself, so all references to it agree
+        return self.blender_object.matrix_world != Matrix.Identity(4)
+
+    def finalize_transforms(self):
+        """Apply deferred transforms to the mesh, if there are any"""
+        if self._transforms_deferred:
+            self.apply_all_transforms()
 
     def apply_all_transforms(self):
-        with self.selected(mode='object'):
-            bpy.ops.object.transform_apply()
+        if self.blender_object.mode == 'EDIT':
+            # Edit mesh overwrites mesh data when leaving edit mode
+            with self.selected(mode='object'):
+                self.apply_all_transforms()
+            return
+        self.blender_object.data.transform(self.blender_object.matrix_world)
+        self.blender_object.matrix_world = Matrix.Identity(4)
+        self._invalidate_coords_cache()
 
     @property
     def dimensions(self):
-        return self.blender_object.dimensions
+        # Computed from vertices, since Blender's cached object bounds are
+        # only refreshed on depsgraph updates, not on direct mesh edits
+        coords = self.coords
+        return Vector(coords.max(axis=0) - coords.min(axis=0))
 
     @property
     def bounding_box(self):
-        return [Vector(x) for x in self.blender_object.bound_box]
+        return [Vector(x) for x in self.bound_box_np]
+
+    @property
+    def bound_box_np(self):
+        """Bounding box corners as an (8, 3) array, ordered as Blender's"""
+        coords = self.coords
+        (x0, y0, z0), (x1, y1, z1) = coords.min(axis=0), coords.max(axis=0)
+        return np.array([(x0, y0, z0), (x0, y0, z1), (x0, y1, z1),
+                         (x0, y1, z0), (x1, y0, z0), (x1, y0, z1),
+                         (x1, y1, z1), (x1, y1, z0)], dtype=np.single)
 
     @property
     def enclosing_sphere_diameter(self):
-        distances = [(v.co - self.location).length for v in self.vertices]
-        return 2 * max(distances)
+        coords = self.coords
+        center = np.asarray(self.location, dtype=np.single)
+        return float(2 * np.sqrt(((coords - center)**2).sum(axis=1).max()))
 
     @property
     def vertices(self):
+        self.finalize_transforms()
         return self.blender_object.data.vertices
 
     @property
     def edges(self):
+        self.finalize_transforms()
         return self.blender_object.data.edges
 
     @property
-    def vertices_vtk(self):
+    def coords(self):
+        """Read-only (n, 3) array of vertex coordinates
+
+        Includes deferred transforms. Mesh coordinates are cached until the
+        mesh is modified through this reference, transformed ones until the
+        object transform changes.
+        """
+        if self._coords_cache is None:
+            self._coords_cache = self._coords_np()
+            self._coords_cache.setflags(write=False)
+        if not self._transforms_deferred:
+            return self._coords_cache
+        matrix_world = self.blender_object.matrix_world
+        if (self._world_coords_cache is None
+                or self._world_coords_cache[0] != matrix_world):
+            matrix = np.array(matrix_world, dtype=np.single)
+            world_coords = self._coords_cache @ matrix[:3, :3].T + matrix[:3, 3]
+            world_coords.setflags(write=False)
+            self._world_coords_cache = (matrix_world.copy(), world_coords)
+        return self._world_coords_cache[1]
+
+    def _invalidate_coords_cache(self):
+        self._coords_cache = None
+        self._world_coords_cache = None
+
+    def _coords_np(self):
+        """Vertex coordinates as an (n, 3) array, fetched in a single copy"""
         vertices = self.blender_object.data.vertices
+        n = len(vertices)
+        # Single precision matches Blender's internal storage, avoiding casts
+        coords = np.empty(3 * n, dtype=np.single)
+        vertices.foreach_get('co', coords)
+        return coords.reshape(n, 3)
+
+    def _edges_np(self):
+        """Edge vertex indices as an (m, 2) array, fetched in a single copy"""
+        edges = self.blender_object.data.edges
+        m = len(edges)
+        edge_vertices = np.empty(2 * m, dtype=np.intc)
+        edges.foreach_get('vertices', edge_vertices)
+        return edge_vertices.reshape(m, 2)
+
+    @property
+    def vertices_vtk(self):
         points = vtk.vtkPoints()
-        coords = vtk.vtkFloatArray()
-        coords.SetNumberOfComponents(3)
-        coords.SetNumberOfTuples(len(vertices))
-        for i, vertex in enumerate(vertices):
-            coords.SetTuple3(i, *vertex.co)
+        coords = numpy_support.numpy_to_vtk(self.coords, deep=True,
+                                            array_type=vtk.VTK_FLOAT)
         points.SetData(coords)
         return points
 
     @property
     def faces_vtk(self):
+        polygons = self.blender_object.data.polygons
+        n_polygons = len(polygons)
+        loop_totals = np.empty(n_polygons, dtype=np.intc)
+        polygons.foreach_get('loop_total', loop_totals)
+        vertex_indices = np.empty(loop_totals.sum(), dtype=np.intc)
+        polygons.foreach_get('vertices', vertex_indices)
+        # Legacy VTK cell layout: [n_0, ids_0..., n_1, ids_1..., ...]
+        cell_starts = np.cumsum(loop_totals) - loop_totals
+        cells = np.insert(vertex_indices, cell_starts, loop_totals)
         faces = vtk.vtkCellArray()
-        for polygon in self.blender_object.data.polygons:
-            faces.InsertNextCell(len(polygon.vertices))
-            for vertex in polygon.vertices:
-                faces.InsertCellPoint(vertex)
+        faces.SetCells(n_polygons, numpy_support.numpy_to_vtkIdTypeArray(
+            cells.astype(numpy_support.ID_TYPE_CODE), deep=True))
         return faces
 
     @property
@@ -143,42 +319,74 @@ class BlenderObjectReference:
         mesh.SetPolys(self.faces_vtk)
         return mesh
 
-    def position_randomly(self, bounding_box=None, fit_in_cylinder=True):
+    def position_randomly(self, bounding_box=None, fit_in_cylinder=True,
+                          defer=True, samples=None):
+        """Shift object to a random position within the bounding box
+
+        `samples` are three uniform numbers in [0, 1) used for the first
+        position candidate instead of drawing them.
+        """
         x_min, x_max, y_min, y_max, z_min, z_max = bounding_box
-        min_shift = (Vector([x_min, y_min, z_min])
-                     - (self.location - self.dimensions/2))
-        max_shift = (Vector([x_max, y_max, z_max])
-                     - (self.location + self.dimensions/2))
-        shift = Vector(np.random.uniform(low=min_shift, high=max_shift))
+        object_bounding_box = self.bound_box_np
+        min_shift = (np.array([x_min, y_min, z_min])
+                     - object_bounding_box.min(axis=0))
+        max_shift = (np.array([x_max, y_max, z_max])
+                     - object_bounding_box.max(axis=0))
+        if samples is None:
+            samples = RNG.random(3)
+        shift = min_shift + (max_shift - min_shift) * np.asarray(samples)
 
         if fit_in_cylinder:
-            cylinder_radius = max(y_max - y_min, z_max - z_min)
-            cylinder_axis = Vector([(y_min + y_max)/2, (z_min + z_max)/2])
-            def point_fits_in_cylinder(point):
-                    return (point.yz - cylinder_axis).length < cylinder_radius
-            def objects_fits_in_cylinder():
-                return all(point_fits_in_cylinder(v.co + shift) for v in self.vertices)
-            while not objects_fits_in_cylinder():
-                shift = Vector(np.random.uniform(low=min_shift, high=max_shift))
-
-        self.translate(shift)
+            cylinder_radius_sq = max(y_max - y_min, z_max - z_min)**2
+            cylinder_axis = np.array([(y_min + y_max)/2, (z_min + z_max)/2])
+            coords_yz = self.coords[:, 1:]
+            bounding_box_yz = object_bounding_box[:, 1:]
+            def objects_fits_in_cylinder(shift):
+                offset_y, offset_z = shift[1:] - cylinder_axis
+                # The cylinder is convex, so a fitting bounding box means a
+                # fitting object and the vertex scan can be skipped
+                return any(points_fit_in_circle(points_yz, offset_y, offset_z,
+                                                cylinder_radius_sq)
+                           for points_yz in (bounding_box_yz, coords_yz))
+            while not objects_fits_in_cylinder(shift):
+                shift = RNG.uniform(low=min_shift, high=max_shift)
+
+        shift = Vector(shift)
+        self.translate(shift, defer=defer)
         return shift
 
-    def apply_random_rotation(self):
-        # Use multiplication by a random unit quaternion
+    def apply_random_rotation(self, defer=True, samples=None):
+        """Rotate object uniformly at random
+
+        `samples` are three uniform numbers in [0, 1) to use instead of
+        drawing them.
+        """
+        # Use multiplication by a random unit quaternion, uniform on the
+        # 3-sphere by Shoemake's method
         # https://en.wikipedia.org/wiki/Rotation_matrix#Uniform_random_rotation_matrices
-        rotation_quaternion = np.random.uniform(low=0.0, high=1.0, size=4)
-        rotation_quaternion /= np.linalg.norm(rotation_quaternion)
-        self.rotate(quaternion=rotation_quaternion)
+        u1, u2, u3 = RNG.random(3) if samples is None else samples
+        rotation_quaternion = np.array([
+            np.sqrt(1 - u1) * np.sin(2*np.pi*u2),
+            np.sqrt(1 - u1) * np.cos(2*np.pi*u2),
+            np.sqrt(u1) * np.sin(2*np.pi*u3),
+            np.sqrt(u1) * np.cos(2*np.pi*u3),
+        ])
+        self.rotate(quaternion=rotation_quaternion, defer=defer)
         return rotation_quaternion
 
     def select(self, mode=None):
+        if mode is not None and mode.upper() == 'EDIT':
+            # Edit mode operates on the mesh, so it must be up to date
+            self.finalize_transforms()
+        if self.blender_object.mode == 'EDIT':
+            # Edit mode changes are synced to the mesh on leaving it
+            self._invalidate_coords_cache()
         bpy.context.view_layer.objects.active = self.blender_object
-        bpy.ops.object.mode_set(mode='OBJECT')
-        bpy.ops.object.select_all(action='DESELECT')
+        _set_mode('OBJECT')
+        deselect_all_objects()
         self.blender_object.select_set(True)
         if mode is not None:
-            bpy.ops.object.mode_set(mode=mode.upper())
+            _set_mode(mode.upper())
 
     @contextmanager
     def selected(self, mode=None):
@@ -189,20 +397,29 @@ class BlenderObjectReference:
         active_object_initial = bpy.context.active_object
         selected_objects_initial = bpy.context.selected_objects
         mode_initial = bpy.context.object.mode
+        if (active_object_initial == self.blender_object
+                and selected_objects_initial == [self.blender_object]
+                and mode_initial == ('OBJECT' if mode is None else mode.upper())):
+            # Already in the requested state, nothing to set or revert
+            yield
+            return
         self.select(mode=mode)
         try:
             yield
         finally:
             try:
                 bpy.context.view_layer.objects.active = active_object_initial
-                bpy.ops.object.mode_set(mode='OBJECT')
-                bpy.ops.object.select_all(action='DESELECT')
+                _set_mode('OBJECT')
+                deselect_all_objects()
                 for obj in selected_objects_initial:
                     obj.select_set(True)
-                bpy.ops.object.mode_set(mode=mode_initial)
+                _set_mode(mode_initial)
             except ReferenceError:
                 # The original object got deleted
                 pass
+            if mode is not None and mode.upper() == 'EDIT':
+                # Edit mode changes are synced to the mesh on leaving it
+                self._invalidate_coords_cache()
 
     def clear_selection(self):
         """Clears selection disregarding selection mode (vertex/edge/face)."""
@@ -233,42 +450,126 @@ class BlenderObjectReference:
                 if criterion_func(edge):
                     edge.select = True
 
+    def select_vertices_vectorized(self, mask_func):
+        """Select vertices using a predicate evaluated on all coordinates at once
+
+        `mask_func` takes an (n, 3) array of vertex coordinates and returns a
+        boolean array of length n.
+        """
+        with self.selected(mode='edit'):
+            bpy.ops.mesh.select_mode(type='VERT')
+            bpy.ops.mesh.select_all(action='DESELECT')
+        with self.selected(mode='object'):
+            mask = np.asarray(mask_func(self.coords), dtype=bool)
+            self.vertices.foreach_set('select', mask)
+
+    def select_edges_vectorized(self, mask_func):
+        """Select edges using a predicate evaluated on all edges at once
+
+        `mask_func` takes an (n, 3) array of vertex coordinates and an (m, 2)
+        array of edge vertex indices and returns a boolean array of length m.
+        """
+        with self.selected(mode='edit'):
+            bpy.ops.mesh.select_mode(type='EDGE')
+            bpy.ops.mesh.select_all(action='DESELECT')
+        with self.selected(mode='object'):
+            mask = np.asarray(mask_func(self.coords, self._edges_np()),
+                              dtype=bool)
+            self.edges.foreach_set('select', mask)
+
+    @contextmanager
+    def edited_bmesh(self):
+        """Edit the mesh as a bmesh that is written back on exiting context
+
+        Runs geometry operations without the operator and edit mode overhead.
+        """
+        self.finalize_transforms()
+        bm = bmesh.new()
+        bm.from_mesh(self.blender_object.data)
+        try:
+            yield bm
+            bm.to_mesh(self.blender_object.data)
+            self.blender_object.data.update()
+        finally:
+            bm.free()
+            self._invalidate_coords_cache()
+
     @_suppress_stdout
     def remove_duplicate_vertices(self):
         with self.selected(mode='edit'):
             bpy.ops.mesh.select_all(action='SELECT')
             bpy.ops.mesh.remove_doubles()
+        self._invalidate_coords_cache()
 
     def smooth_edges(self, degree=0.05, n_segments=3):
         """Smooth all edges using bevel modifier"""
-        with self.selected(mode='object'):
-            bevel_width = degree * max(self.dimensions)
-            if bevel_width < BLENDER_EPS:
-                return
-            bpy.ops.object.modifier_add(type='BEVEL')
-            bpy.context.object.modifiers['Bevel'].offset_type = 'WIDTH'
-            bpy.context.object.modifiers['Bevel'].width = bevel_width
-            bpy.context.object.modifiers['Bevel'].segments = n_segments
-            bpy.context.object.modifiers['Bevel'].angle_limit = np.deg2rad(10)
-            bpy.ops.object.modifier_apply(modifier='Bevel')
+        self.finalize_transforms()
+        bevel_width = degree * max(self.dimensions)
+        if bevel_width < BLENDER_EPS:
+            return
+        self._apply_modifier('BEVEL', offset_type='WIDTH', width=bevel_width,
+                             segments=n_segments, angle_limit=np.deg2rad(10))
         self.remove_duplicate_vertices()
 
     def apply_boolean(self, other, operation='intersect'):
         """Apply a boolean operation based on another object"""
-        with self.selected(mode='object'):
-            bpy.ops.object.modifier_add(type='BOOLEAN')
-            bpy.context.object.modifiers['Boolean'].operation = operation.upper()
-            bpy.context.object.modifiers['Boolean'].object = other.blender_object
-            bpy.ops.object.modifier_apply(modifier='Boolean')
+        other.finalize_transforms()
+        self._apply_modifier('BOOLEAN', operation=operation.upper(),
+                             object=other.blender_object)
 
     def triangulate(self, quad_method='beauty', ngon_method='beauty'):
-        with self.selected(mode='object'):
-            bpy.ops.object.modifier_add(type='TRIANGULATE')
-            bpy.context.object.modifiers["Triangulate"].quad_method = quad_method.upper()
-            bpy.context.object.modifiers["Triangulate"].ngon_method = ngon_method.upper()
-            bpy.ops.object.modifier_apply(modifier='Triangulate')
+        self._apply_modifier('TRIANGULATE', quad_method=quad_method.upper(),
+                             ngon_method=ngon_method.upper())
+
+    def _apply_modifier(self, modifier_type, **settings):
+        """Add a modifier with given settings and apply it to the mesh
+
+        Uses the data API instead of operators, so the object doesn't need to
+        be selected or active.
+        """
+        self.finalize_transforms()
+        modifiers = self.blender_object.modifiers
+        # Evaluation bakes the whole stack, so only the new modifier may be on
+        other_modifiers = [m for m in modifiers if m.show_viewport]
+        for other_modifier in other_modifiers:
+            other_modifier.show_viewport = False
+        modifier = modifiers.new(name=modifier_type.title(), type=modifier_type)
+        try:
+            for name, value in settings.items():
+                setattr(modifier, name, value)
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+            mesh_initial = self.blender_object.data
+            self.blender_object.data = bpy.data.meshes.new_from_object(
+                self.blender_object.evaluated_get(depsgraph))
+        finally:
+            modifiers.remove(modifier)
+            for other_modifier in other_modifiers:
+                other_modifier.show_viewport = True
+        if mesh_initial.users == 0:
+            bpy.data.meshes.remove(mesh_initial)
+        self._invalidate_coords_cache()
 
     def export_stl(self, filepath):
+        self.finalize_transforms()
         with self.selected(mode='object'):
             filepath = os.path.join(os.getcwd(), filepath)
             bpy.ops.export_mesh.stl(filepath=filepath, use_selection=True)
+
+    def export_stl_fast(self, filepath):
+        """Export binary STL by writing all triangles at once"""
+        self.finalize_transforms()
+        mesh = self.blender_object.data
+        mesh.calc_loop_triangles()
+        n_triangles = len(mesh.loop_triangles)
+        vertex_indices = np.empty(3 * n_triangles, dtype=np.intc)
+        mesh.loop_triangles.foreach_get('vertices', vertex_indices)
+        normals = np.empty(3 * n_triangles, dtype=np.single)
+        mesh.loop_triangles.foreach_get('normal', normals)
+
+        triangles = np.zeros(n_triangles, dtype=_STL_DTYPE)
+        triangles['normal'] = normals.reshape(n_triangles, 3)
+        triangles['vertices'] = self.coords[vertex_indices].reshape(n_triangles, 3, 3)
+        with open(filepath, 'wb') as f:
+            f.write(bytes(80))  # Empty header
+            np.array([n_triangles], dtype='<u4').tofile(f)
+            triangles.tofile(f)
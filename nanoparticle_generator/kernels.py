@@ -0,0 +1,71 @@
+"""Numerical kernels, compiled with Numba if it is available"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _points_fit_in_circle_numpy(points, offset_x, offset_y, radius_sq):
+    """Check if all shifted 2D points lie within a circle at the origin"""
+    offset = points + np.array([offset_x, offset_y])
+    return (offset**2).sum(axis=1).max() < radius_sq
+
+
+def _points_fit_in_circle_loop(points, offset_x, offset_y, radius_sq):
+    """Check if all shifted 2D points lie within a circle at the origin
+
+    Exits early on the first point outside the circle.
+    """
+    for i in range(points.shape[0]):
+        dx = points[i, 0] + offset_x
+        dy = points[i, 1] + offset_y
+        if dx*dx + dy*dy >= radius_sq:
+            return False
+    return True
+
+
+if njit is not None:
+    points_fit_in_circle = njit(cache=True, fastmath=True)(
+        _points_fit_in_circle_loop)
+else:
+    points_fit_in_circle = _points_fit_in_circle_numpy
+
+
+def _vertical_edge_mask_numpy(coords, edge_vertices, eps):
+    """Mask of edges whose vertices share x and y coordinates"""
+    xy1 = coords[edge_vertices[:, 0], :2]
+    xy2 = coords[edge_vertices[:, 1], :2]
+    return np.all(np.abs(xy2 - xy1) < eps, axis=1)
+
+
+def _vertical_edge_mask_loop(coords, edge_vertices, eps):
+    """Mask of edges whose vertices share x and y coordinates"""
+    mask = np.empty(edge_vertices.shape[0], dtype=np.bool_)
+    for i in range(edge_vertices.shape[0]):
+        v1, v2 = edge_vertices[i, 0], edge_vertices[i, 1]
+        mask[i] = (abs(coords[v2, 0] - coords[v1, 0]) < eps
+                   and abs(coords[v2, 1] - coords[v1, 1]) < eps)
+    return mask
+
+
+def _out_of_z_plane_mask_numpy(coords, eps):
+    """Mask of vertices not lying in the z = 0 plane"""
+    return np.abs(coords[:, 2]) > eps
+
+
+def _out_of_z_plane_mask_loop(coords, eps):
+    """Mask of vertices not lying in the z = 0 plane"""
+    mask = np.empty(coords.shape[0], dtype=np.bool_)
+    for i in range(coords.shape[0]):
+        mask[i] = abs(coords[i, 2]) > eps
+    return mask
+
+
+if njit is not None:
+    vertical_edge_mask = njit(cache=True)(_vertical_edge_mask_loop)
+    out_of_z_plane_mask = njit(cache=True)(_out_of_z_plane_mask_loop)
+else:
+    vertical_edge_mask = _vertical_edge_mask_numpy
+    out_of_z_plane_mask = _out_of_z_plane_mask_numpy
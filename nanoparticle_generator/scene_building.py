@@ -1,8 +1,4 @@
-import random
-
-import numpy as np
-
-from nanoparticle_generator.blender import BlenderScene
+from nanoparticle_generator.blender import RNG, BlenderScene
 from nanoparticle_generator.shapes.randomized import fcc
 
 
@@ -13,24 +9,33 @@ class Scene(BlenderScene):
         BlenderScene.__init__(self)
 
     def add_random_shape(self, shape_package=fcc):
-        shape = random.choice(shape_package.ALL_SHAPES)()
-        shape.apply_random_rotation()
-        scale_factor = np.random.uniform(low=0.75, high=0.9)
+        shapes = shape_package.ALL_SHAPES
+        shape = shapes[RNG.integers(len(shapes))]()
+        # Rotation, scale and position samples
+        samples = RNG.random(7)
+        shape.apply_random_rotation(samples=samples[:3])
+        scale_factor = 0.75 + 0.15*samples[3]
         shape.scale(scale_factor / max(shape.dimensions))
-        shape.position_randomly(bounding_box=[0.95*x for x in self.extent])
+        shape.position_randomly(bounding_box=[0.95*x for x in self.extent],
+                                samples=samples[4:])
         return shape
 
     def add_random_core_shell_shape(self, shape_package=fcc):
-        shell_shape = random.choice(shape_package.CORE_SHELL_SUITABLE_SHAPES)()
-        shell_rotation_quaternion = shell_shape.apply_random_rotation()
-        shell_scale_factor = np.random.uniform(low=0.75, high=0.9)
+        shapes = shape_package.CORE_SHELL_SUITABLE_SHAPES
+        shell_shape_index, core_shape_index = RNG.integers(len(shapes), size=2)
+        # Shell rotation, shell scale, shell position and core scale samples
+        samples = RNG.random(8)
+        shell_shape = shapes[shell_shape_index]()
+        shell_rotation_quaternion = shell_shape.apply_random_rotation(
+            samples=samples[:3])
+        shell_scale_factor = 0.75 + 0.15*samples[3]
         shell_shape.scale(shell_scale_factor / max(shell_shape.dimensions))
         shell_shift = shell_shape.position_randomly(
-            bounding_box=[0.95*x for x in self.extent])
+            bounding_box=[0.95*x for x in self.extent], samples=samples[4:7])
 
-        core_shape = random.choice(shape_package.CORE_SHELL_SUITABLE_SHAPES)()
+        core_shape = shapes[core_shape_index]()
         core_shape.rotate(quaternion=shell_rotation_quaternion)
-        core_scale_factor = np.random.uniform(low=0.5, high=0.9)
+        core_scale_factor = 0.5 + 0.4*samples[7]
         core_shape.scale(core_scale_factor * shell_shape.enclosing_sphere_diameter
                          / core_shape.enclosing_sphere_diameter)
         core_shape.translate(shell_shift)
@@ -1,16 +1,48 @@
+import bmesh
 import bpy
 import numpy as np
 
-from nanoparticle_generator.blender import BLENDER_EPS, BlenderObjectReference
+from nanoparticle_generator.blender import (BLENDER_EPS, BlenderObjectReference,
+                                            add_mesh_object)
+from nanoparticle_generator.kernels import out_of_z_plane_mask, vertical_edge_mask
+
+
+_PRIMITIVE_MESHES = {}
+
+
+def _add_primitive(kind, add_primitive, **kwargs):
+    """Add a primitive object, copying the mesh of an identical earlier one
+
+    Primitives are deterministic, so each is built by the operator only once
+    and every instance, including the first, is a copy of the template mesh.
+    Returns the new object, which is also made active and the only selected.
+    """
+    key = (kind, tuple(sorted(kwargs.items())))
+    mesh = None
+    if key in _PRIMITIVE_MESHES:
+        try:
+            mesh = _PRIMITIVE_MESHES[key].copy()
+        except ReferenceError:
+            # Blender data got reset since caching
+            del _PRIMITIVE_MESHES[key]
+    if mesh is None:
+        add_primitive(**kwargs)
+        temporary_object = bpy.context.object
+        template = temporary_object.data
+        bpy.data.objects.remove(temporary_object)
+        template.use_fake_user = True  # Keep unused mesh from being purged
+        _PRIMITIVE_MESHES[key] = template
+        mesh = template.copy()
+    return add_mesh_object(kind.title(), mesh)
 
 
 class Ellipsoid(BlenderObjectReference):
     def __init__(self, dimensions=(1.0, 1.0, 1.0), subdivisions=5):
         if isinstance(dimensions, (float, int)):
             dimensions = (dimensions,) * 3
-        bpy.ops.mesh.primitive_ico_sphere_add(subdivisions=subdivisions,
-                                              radius=0.5)
-        BlenderObjectReference.__init__(self, bpy.context.object)
+        BlenderObjectReference.__init__(self, _add_primitive(
+            'sphere', bpy.ops.mesh.primitive_ico_sphere_add,
+            subdivisions=subdivisions, radius=0.5))
         self.scale(dimensions)
 
 
@@ -18,16 +50,17 @@ class Box(BlenderObjectReference):
     def __init__(self, dimensions=(1.0, 1.0, 1.0)):
         if isinstance(dimensions, (float, int)):
             dimensions = (dimensions,) * 3
-        bpy.ops.mesh.primitive_cube_add(size=1.0)
-        BlenderObjectReference.__init__(self, bpy.context.object)
+        BlenderObjectReference.__init__(self, _add_primitive(
+            'cube', bpy.ops.mesh.primitive_cube_add, size=1.0))
         self.scale(dimensions)
 
 
 class Cylinder(BlenderObjectReference):
     def __init__(self, diameter=1.0, height=1.0, vertices=32):
-        bpy.ops.mesh.primitive_cylinder_add(vertices=vertices,
-                                            radius=diameter/2, depth=height)
-        BlenderObjectReference.__init__(self, bpy.context.object)
+        BlenderObjectReference.__init__(self, _add_primitive(
+            'cylinder', bpy.ops.mesh.primitive_cylinder_add,
+            vertices=vertices, radius=0.5, depth=1.0))
+        self.scale((diameter, diameter, height))
 
 
 class SphericallyCappedCylinder(BlenderObjectReference):
@@ -35,30 +68,27 @@ class SphericallyCappedCylinder(BlenderObjectReference):
         Ellipsoid.__init__(self, diameter, subdivisions=subdivisions)
         with self.selected(mode='edit'):
             # Extrude upper cap
-            self.select_vertices(criterion_func=lambda v: v.co[2] > -BLENDER_EPS)
+            self.select_vertices_vectorized(
+                mask_func=lambda coords: coords[:, 2] > -BLENDER_EPS)
             bpy.ops.mesh.extrude_region_move(
                 TRANSFORM_OT_translate={'value': (0, 0, middle_section_height/2)}
             )
             # Move lower cap
-            self.select_vertices(criterion_func=lambda v: v.co[2] < BLENDER_EPS)
+            self.select_vertices_vectorized(
+                mask_func=lambda coords: coords[:, 2] < BLENDER_EPS)
             bpy.ops.transform.translate(value=(0, 0, -middle_section_height/2))
 
 
 class Octahedron(BlenderObjectReference):
     def __init__(self, size=1.0, truncation_degree=0.0):
-        bpy.ops.mesh.primitive_cube_add(size=1.0)
-        BlenderObjectReference.__init__(self, bpy.context.object)
-        bpy.ops.object.modifier_add(type='BEVEL')
-        bpy.context.object.modifiers['Bevel'].offset_type = 'PERCENT'
-        bpy.context.object.modifiers['Bevel'].width_pct = 100
-        bpy.ops.object.modifier_apply(modifier='Bevel')  # To actually apply it
+        BlenderObjectReference.__init__(self, _add_primitive(
+            'cube', bpy.ops.mesh.primitive_cube_add, size=1.0))
+        self._apply_modifier('BEVEL', offset_type='PERCENT', width_pct=100)
         self.remove_duplicate_vertices()
         if truncation_degree > 0:
-            bpy.ops.object.modifier_add(type='BEVEL')
-            bpy.context.object.modifiers['Bevel'].offset_type = 'PERCENT'
             truncation_degree /= 3  # Since edges meet at 33.3% offset
-            bpy.context.object.modifiers['Bevel'].width_pct = 100 * truncation_degree
-            bpy.ops.object.modifier_apply(modifier='Bevel')
+            self._apply_modifier('BEVEL', offset_type='PERCENT',
+                                 width_pct=100*truncation_degree)
             self.remove_duplicate_vertices()
         # Adjust object size after truncation
         self.scale(size / self.enclosing_sphere_diameter)
@@ -66,8 +96,10 @@ class Octahedron(BlenderObjectReference):
 
 class Icosahedron(BlenderObjectReference):
     def __init__(self, size=1.0):
-        bpy.ops.mesh.primitive_ico_sphere_add(subdivisions=1, radius=size/2)
-        BlenderObjectReference.__init__(self, bpy.context.object)
+        BlenderObjectReference.__init__(self, _add_primitive(
+            'sphere', bpy.ops.mesh.primitive_ico_sphere_add,
+            subdivisions=1, radius=0.5))
+        self.scale(size)
 
 
 class Prism(BlenderObjectReference):
@@ -75,41 +107,41 @@ class Prism(BlenderObjectReference):
                  tips_smoothing_degree=0.0, edges_smoothing_degree=0.0,
                  smoothing_bevel_segments=3):
         """Diameter corresponds to enclosing cylinder."""
-        bpy.ops.mesh.primitive_cylinder_add(vertices=n_sides, radius=size/2,
-                                            depth=height)
-        BlenderObjectReference.__init__(self, bpy.context.object)
-
-        def is_edge_vertical(edge):
-            v1_id, v2_id = edge.vertices
-            x1, y1, _ = self.vertices[v1_id].co
-            x2, y2, _ = self.vertices[v2_id].co
-            return abs(x2 - x1) < BLENDER_EPS and abs(y2 - y1) < BLENDER_EPS
+        BlenderObjectReference.__init__(self, _add_primitive(
+            'cylinder', bpy.ops.mesh.primitive_cylinder_add,
+            vertices=n_sides, radius=0.5, depth=1.0))
+        self.scale((size, size, height))
+
+        def is_edge_vertical(coords, edge_vertices):
+            return vertical_edge_mask(coords, edge_vertices, BLENDER_EPS)
+
+        def bevel_edges(mask_func, **kwargs):
+            self.finalize_transforms()
+            mask = mask_func(self.coords, self._edges_np())
+            with self.edited_bmesh() as bm:
+                # bmesh keeps the mesh element order, so the mask applies as is
+                bm.edges.ensure_lookup_table()
+                bmesh.ops.bevel(bm, geom=[bm.edges[i] for i in np.flatnonzero(mask)],
+                                affect='EDGES', profile=0.5, clamp_overlap=True,
+                                **kwargs)
+                # Clamped bevels meet, leaving duplicates that would break
+                # subsequent bevels
+                bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=BLENDER_EPS)
 
         if truncation_degree > 0:
-            with self.selected(mode='edit'):
-                self.select_edges(criterion_func=is_edge_vertical)
-                truncation_degree *= 0.5  # Since edges meet at 50% offset
-                bpy.ops.mesh.bevel(offset_type='PERCENT',
-                                offset_pct=100*truncation_degree,
-                                clamp_overlap=True)
-            # Bevel is applied upon switching back to object mode
-            self.remove_duplicate_vertices()
+            truncation_degree *= 0.5  # Since edges meet at 50% offset
+            bevel_edges(is_edge_vertical, offset_type='PERCENT',
+                        offset=100*truncation_degree, segments=1)
 
         # Smooth tips and horizontal edges separately because of high anisotropy
         if tips_smoothing_degree > 0:
-            with self.selected(mode='edit'):
-                self.select_edges(criterion_func=is_edge_vertical)
-                bpy.ops.mesh.bevel(offset=tips_smoothing_degree*self.dimensions.x,
-                                   segments=smoothing_bevel_segments,
-                                   clamp_overlap=True)
-            self.remove_duplicate_vertices()
+            bevel_edges(is_edge_vertical, offset_type='OFFSET',
+                        offset=tips_smoothing_degree*self.dimensions.x,
+                        segments=smoothing_bevel_segments)
         if edges_smoothing_degree > 0:
-            with self.selected(mode='edit'):
-                self.select_edges(criterion_func=lambda x: not is_edge_vertical(x))
-                bpy.ops.mesh.bevel(offset=edges_smoothing_degree*self.dimensions.z,
-                                segments=smoothing_bevel_segments,
-                                clamp_overlap=True)
-            self.remove_duplicate_vertices()
+            bevel_edges(lambda *a: ~is_edge_vertical(*a), offset_type='OFFSET',
+                        offset=edges_smoothing_degree*self.dimensions.z,
+                        segments=smoothing_bevel_segments)
         # Adjust object size after truncation
         self.scale(size / np.hypot(self.dimensions.x, self.dimensions.y))
 
@@ -120,29 +152,26 @@ class Bipyramid(BlenderObjectReference):
         """Diameter corresponds to enclosing cylinder."""
         bpy.ops.mesh.primitive_circle_add(vertices=n_sides, radius=diameter/2)
         BlenderObjectReference.__init__(self, bpy.context.object)
-        with self.selected(mode='edit'):
-            bpy.ops.mesh.select_all(action='SELECT')
-            # Upper half
-            bpy.ops.mesh.extrude_region_move(
-                TRANSFORM_OT_translate={'value': (0, 0, height/2)}
-            )
-            # Bring all extruded vertices together on the axis
-            bpy.ops.transform.resize(value=(0, 0, 0))
-            # Lower half
-            self.select_vertices(criterion_func=lambda v: v.co[2] < BLENDER_EPS)
-            bpy.ops.mesh.extrude_region_move(
-                TRANSFORM_OT_translate={'value': (0, 0, -height/2)}
-            )
-            bpy.ops.transform.resize(value=(0, 0, 0))
-            self.remove_duplicate_vertices()
-
-            if tips_truncation_degree > 0:
-                def is_vertex_out_of_plane(vertex):
-                    return abs(vertex.co[2]) > BLENDER_EPS
-                self.select_vertices(criterion_func=is_vertex_out_of_plane)
-                bevel_width = tips_truncation_degree * max(self.dimensions)
-                if bevel_width < BLENDER_EPS:
-                    return
-                bpy.ops.mesh.bevel(affect='VERTICES', offset_type='WIDTH', offset=bevel_width,
-                                   segments=1, clamp_overlap=True)
-                self.remove_duplicate_vertices()
+        with self.edited_bmesh() as bm:
+            ring_edges = list(bm.edges)
+            for tip_height in (height/2, -height/2):
+                # Extrude the ring and bring extruded vertices together on the axis
+                extruded = bmesh.ops.extrude_edge_only(bm, edges=ring_edges)
+                extruded_vertices = [x for x in extruded['geom']
+                                     if isinstance(x, bmesh.types.BMVert)]
+                bmesh.ops.pointmerge(bm, verts=extruded_vertices,
+                                     merge_co=(0, 0, tip_height))
+            bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
+
+        if tips_truncation_degree > 0:
+            bevel_width = tips_truncation_degree * max(self.dimensions)
+            if bevel_width < BLENDER_EPS:
+                return
+            mask = out_of_z_plane_mask(self.coords, BLENDER_EPS)
+            with self.edited_bmesh() as bm:
+                bm.verts.ensure_lookup_table()
+                bmesh.ops.bevel(bm, geom=[bm.verts[i] for i in np.flatnonzero(mask)],
+                                affect='VERTICES', offset_type='WIDTH',
+                                offset=bevel_width, segments=1, profile=0.5,
+                                clamp_overlap=True)
+                bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=BLENDER_EPS)